@@ -0,0 +1,86 @@
+import base64
+import binascii
+import re
+import uuid
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from drf_extra_fields.fields import Base64FieldMixin, Base64ImageField
+from PIL import Image
+from rest_framework import serializers
+
+
+class StreamingBase64ImageField(Base64ImageField):
+    """
+    Base64ImageField, декодирующий изображение частями во временный файл.
+
+    Декодированные данные не собираются в памяти целиком, а хранилище
+    перемещает временный файл на место вместо копирования содержимого.
+    """
+
+    # Кратно 4, чтобы каждая часть декодировалась независимо
+    CHUNK_SIZE = 4096
+    BASE64_HEADER = ';base64,'
+    NON_ALPHABET = re.compile(r'[^A-Za-z0-9+/=]')
+
+    def to_internal_value(self, base64_data):
+        if base64_data in self.EMPTY_VALUES:
+            return None
+        if not isinstance(base64_data, str):
+            raise serializers.ValidationError(self.INVALID_FILE_MESSAGE)
+
+        content_type = None
+        start = base64_data.find(self.BASE64_HEADER)
+        if start == -1:
+            start = 0
+        else:
+            if self.trust_provided_content_type:
+                content_type = base64_data[:start].replace('data:', '')
+            start += len(self.BASE64_HEADER)
+
+        upload = TemporaryUploadedFile(
+            uuid.uuid4().hex, content_type, 0, None
+        )
+        try:
+            for chunk in self._iter_aligned_chunks(base64_data, start):
+                upload.write(base64.b64decode(chunk))
+            upload.size = upload.tell()
+            upload.name = f'{upload.name}.{self._get_extension(upload)}'
+        except (TypeError, binascii.Error, ValueError):
+            upload.close()
+            raise serializers.ValidationError(self.INVALID_FILE_MESSAGE)
+        except serializers.ValidationError:
+            upload.close()
+            raise
+        upload.seek(0)
+        return super(Base64FieldMixin, self).to_internal_value(upload)
+
+    def _iter_aligned_chunks(self, base64_data, start):
+        """
+        Отдает части данных длиной кратной 4 без символов вне алфавита
+        base64, как их отбрасывает b64decode. Иначе перенос строк
+        (base64 в стиле MIME) сдвигает границы частей.
+        """
+        rest = ''
+        for offset in range(start, len(base64_data), self.CHUNK_SIZE):
+            chunk = rest + self.NON_ALPHABET.sub(
+                '', base64_data[offset:offset + self.CHUNK_SIZE]
+            )
+            aligned = len(chunk) - len(chunk) % 4
+            rest = chunk[aligned:]
+            if aligned:
+                yield chunk[:aligned]
+        if rest:
+            yield rest
+
+    def _get_extension(self, upload):
+        """Определяет расширение по содержимому файла."""
+        upload.seek(0)
+        try:
+            with Image.open(upload) as image:
+                extension = image.format.lower()
+        except (OSError, AttributeError):
+            raise serializers.ValidationError(self.INVALID_FILE_MESSAGE)
+        extension = 'jpg' if extension == 'jpeg' else extension
+        if extension not in self.ALLOWED_TYPES:
+            raise serializers.ValidationError(self.INVALID_TYPE_MESSAGE)
+        return extension
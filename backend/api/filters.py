@@ -16,15 +16,22 @@ class IngredientSearchFilter(df_filters.FilterSet):
         fields = ('name',)
 
 
+class UserRelationFilter(df_filters.BooleanFilter):
+    """
+    Фильтр рецептов по связи с текущим пользователем.
+    Путь к пользователю задается в field_name при объявлении фильтра.
+    Применяется в CustomRecipeFilter.filter_queryset вместе
+    с остальными фильтрами этого типа.
+    """
+
+
 class CustomRecipeFilter(df_filters.FilterSet):
     """Расширенный фильтр для рецептов с поддержкой избранного"""
 
-    is_in_shopping_cart = df_filters.BooleanFilter(
-        method='filter_shopping_cart'
-    )
-    is_favorited = df_filters.BooleanFilter(
-        method='filter_favorites'
+    is_in_shopping_cart = UserRelationFilter(
+        field_name='shopping_carts__user'
     )
+    is_favorited = UserRelationFilter(field_name='favorites__user')
     tags = df_filters.ModelMultipleChoiceFilter(
         field_name="tags__slug",
         to_field_name="slug",
@@ -41,28 +48,27 @@ class CustomRecipeFilter(df_filters.FilterSet):
             'is_favorited'
         )
 
-    def _apply_user_filter(self, queryset, field_name, enabled):
-        """Общий метод для фильтрации по связанным с пользователем полям"""
-        if not enabled:
-            return queryset
-
-        user = self.request.user
-        if user.is_authenticated:
-            return queryset.filter(**{field_name: user})
-        return queryset.none()
+    def filter_queryset(self, queryset):
+        """
+        Применяет фильтры по связям с пользователем одним вызовом filter().
+        Для анонимного пользователя сразу возвращает пустую выборку.
+        """
+        filters = [
+            (self.filters[name], value)
+            for name, value in self.form.cleaned_data.items()
+        ]
+        lookups = [
+            filter_.field_name
+            for filter_, value in filters
+            if value and isinstance(filter_, UserRelationFilter)
+        ]
+        if lookups:
+            user = self.request.user
+            if not user.is_authenticated:
+                return queryset.none()
+            queryset = queryset.filter(**dict.fromkeys(lookups, user))
 
-    def filter_shopping_cart(self, queryset, name, value):
-        """Фильтрация рецептов в списке покупок пользователя"""
-        return self._apply_user_filter(
-            queryset,
-            "shopping_carts__user",
-            value
-        )
-
-    def filter_favorites(self, queryset, name, value):
-        """Фильтрация избранных рецептов пользователя"""
-        return self._apply_user_filter(
-            queryset,
-            "favorites__user",
-            value
-        )
+        for filter_, value in filters:
+            if not isinstance(filter_, UserRelationFilter):
+                queryset = filter_.filter(queryset, value)
+        return queryset
@@ -0,0 +1,68 @@
+import copy
+from functools import lru_cache
+
+from rest_framework import serializers
+
+
+class CachedFieldsMixin:
+    """
+    Кэширует набор полей сериализатора на уровне класса.
+
+    Поля строятся один раз на класс, каждый экземпляр получает их
+    поверхностные копии. Вложенные сериализаторы и составные поля
+    (ListField, DictField, ManyRelatedField) копируются глубоко:
+    их дочерние поля привязываются к родителю и его контексту.
+    """
+
+    _fields_cache = None
+
+    def __init_subclass__(cls, **kwargs):
+        """Каждый подкласс строит собственный набор полей."""
+        super().__init_subclass__(**kwargs)
+        cls._fields_cache = None
+
+    def get_fields(self):
+        cls = type(self)
+        if cls._fields_cache is None:
+            cls._fields_cache = super().get_fields()
+        return {
+            name: (
+                copy.deepcopy(field)
+                if self._has_bound_children(field)
+                else copy.copy(field)
+            )
+            for name, field in cls._fields_cache.items()
+        }
+
+    @staticmethod
+    def _has_bound_children(field):
+        """Поле хранит дочерние поля, которые нельзя делить."""
+        return (
+            isinstance(field, serializers.BaseSerializer)
+            or hasattr(field, 'child')
+            or hasattr(field, 'child_relation')
+        )
+
+
+@lru_cache(maxsize=None)
+def _shared_instances(classes):
+    """Один набор экземпляров на каждую комбинацию классов."""
+    return tuple(klass() for klass in classes)
+
+
+class SharedInstancesMixin:
+    """
+    Переиспользует экземпляры разрешений и фильтров между запросами.
+
+    Классы разрешений и фильтров не хранят состояния, поэтому
+    создавать их заново на каждый запрос не нужно. Учитываются
+    permission_classes, переопределенные в action.
+    """
+
+    def get_permissions(self):
+        return list(_shared_instances(tuple(self.permission_classes)))
+
+    def filter_queryset(self, queryset):
+        for backend in _shared_instances(tuple(self.filter_backends)):
+            queryset = backend.filter_queryset(self.request, queryset, self)
+        return queryset
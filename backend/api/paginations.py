@@ -1,4 +1,4 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 from foodgram import consts
 
@@ -7,3 +7,49 @@ class CustomPagination(PageNumberPagination):
     page_size = consts.PAGE_SIZE
     page_size_query_param = "limit"
     max_page_size = consts.MAX_PAGE_SIZE
+
+
+class CustomCursorPagination(CursorPagination):
+    """Keyset-пагинация: стоимость выборки не зависит от глубины страницы."""
+
+    page_size = consts.PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = consts.MAX_PAGE_SIZE
+    ordering = ("-id",)
+
+
+class RecipeCursorPagination(CustomCursorPagination):
+    """
+    Keyset-пагинация рецептов в том же порядке, что и постраничная:
+    по названию, id разделяет рецепты с одинаковым названием.
+    """
+
+    ordering = ("name", "id")
+
+
+class RecipePagination(CustomPagination):
+    """
+    Пагинация рецептов.
+    По умолчанию постраничная с полями count/next/previous.
+    Keyset-пагинация включается явно: запрос с параметром cursor
+    (для первой страницы - пустым, ?cursor=) возвращает ответ
+    CursorPagination, ссылки next/previous которого содержат
+    следующий курсор. Порядок рецептов в обоих режимах одинаков.
+    """
+
+    cursor_pagination_class = RecipeCursorPagination
+    cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_param in request.query_params:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -15,5 +15,5 @@ class IsAuthorOrReadOnly(BasePermission):
         """Проверка разрешений для конкретного объекта"""
         return (
             request.method in SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.id
         )
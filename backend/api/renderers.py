@@ -0,0 +1,23 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON-рендерер на основе orjson.
+    Типы, которые orjson не знает, передаются кодировщику DRF.
+    Ответы с отступами (browsable API) формирует стандартный рендерер.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
@@ -1,6 +1,7 @@
 from django.core.validators import MinValueValidator
+from django.db import transaction
+from django.utils.functional import cached_property
 from rest_framework import serializers
-from drf_extra_fields.fields import Base64ImageField
 from djoser.serializers import (
     UserSerializer as DjoserUserSerializer
 )
@@ -11,13 +12,12 @@ from recipes.models import (
     RecipeIngredient,
     Ingredient,
     Tag,
-    Favorite,
-    ShoppingCart,
-    Subscription,
 )
+from api.fields import StreamingBase64ImageField
+from api.mixins import CachedFieldsMixin
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для модели Ingredient."""
 
     class Meta:
@@ -25,7 +25,7 @@ class IngredientSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для модели Tag."""
 
     class Meta:
@@ -33,140 +33,113 @@ class TagSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class UserSerializer(DjoserUserSerializer):
+class UserSerializer(CachedFieldsMixin, DjoserUserSerializer):
     """Расширенный сериализатор пользователя с поддержкой подписок."""
 
-    avatar = Base64ImageField(required=False, allow_null=True)
+    avatar = StreamingBase64ImageField(required=False, allow_null=True)
     is_subscribed = serializers.SerializerMethodField()
 
     class Meta(DjoserUserSerializer.Meta):
         fields = DjoserUserSerializer.Meta.fields + ('is_subscribed', 'avatar')
         read_only_fields = ('id', 'is_subscribed')
 
+    @cached_property
+    def current_user(self):
+        """
+        Аутентифицированный пользователь запроса или None.
+        Вычисляется один раз на экземпляр сериализатора, который
+        при many=True общий для всех объектов списка.
+        """
+        request = self.context.get("request")
+        if request and request.user.is_authenticated:
+            return request.user
+        return None
+
     def get_is_subscribed(self, obj):
         """
         Проверяет, подписан ли текущий пользователь
         на данного пользователя.
         """
-        request = self.context.get("request")
-        return (
-            request and request.user.is_authenticated
-            and request.user.subscriptions.filter(subscribed_to=obj).exists()
-        )
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
+        if self.current_user is None or obj.pk == self.current_user.pk:
+            return False
+        return obj.pk in self.subscribed_ids
+
+    @cached_property
+    def subscribed_ids(self):
+        """
+        Id авторов, на которых подписан текущий пользователь.
+        Загружаются одним запросом и сохраняются в запросе,
+        чтобы все сериализаторы ответа использовали один набор.
+        """
+        request = self.context["request"]
+        subscribed_ids = getattr(request, "_subscribed_ids", None)
+        if subscribed_ids is None:
+            subscribed_ids = frozenset(
+                self.current_user.subscriptions.values_list(
+                    "subscribed_to_id", flat=True
+                )
+            )
+            request._subscribed_ids = subscribed_ids
+        return subscribed_ids
 
 
 class UserSubscriptionSerializer(UserSerializer):
     """Сериализатор для отображения подписок пользователя."""
 
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.ReadOnlyField(source="recipes.count")
+    recipes_count = serializers.IntegerField(read_only=True)
 
     class Meta(UserSerializer.Meta):
         fields = UserSerializer.Meta.fields + ("recipes", "recipes_count")
         read_only_fields = fields
 
-    def get_recipes(self, obj):
-        """Возвращает ограниченное количество рецептов пользователя."""
+    @cached_property
+    def recipes_limit(self):
+        """Ограничение количества рецептов из параметров запроса."""
         request = self.context.get("request")
-        recipes = obj.recipes.all()
-
         try:
             limit = int(request.GET.get("recipes_limit"))
-            recipes = recipes[:limit]
-        except (ValueError, TypeError):
-            pass
-
-        return RecipeShortSerializer(
-            recipes, many=True, context=self.context
-        ).data
-
-    def validate(self, data):
-        """Валидация при создании подписки"""
-        user = self.context['request'].user
-        author = self.context['view'].get_object()
-
-        if user == author:
-            raise serializers.ValidationError(
-                {'subscribed_to': 'Нельзя подписаться на самого себя'}
-            )
-
-        if Subscription.objects.filter(
-            user=user,
-            subscribed_to=author
-        ).exists():
-            raise serializers.ValidationError(
-                {'subscribed_to': 'Вы уже подписаны на этого пользователя'}
-            )
-
-        return data
-
-
-class FavoriteShoppingCartSerializer(serializers.ModelSerializer):
-    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
-    recipe = serializers.PrimaryKeyRelatedField(queryset=Recipe.objects.all())
-
-    class Meta:
-        fields = ('user', 'recipe')
-
-
-class FavoriteSerializer(FavoriteShoppingCartSerializer):
-    """Сериализатор для добавления рецепта в избранное."""
-    class Meta(FavoriteShoppingCartSerializer.Meta):
-        model = Favorite
-
-    def validate(self, data):
-        """Проверяет, не добавлен ли рецепт уже в избранное."""
-        user = data['user']
-        recipe = data['recipe']
-
-        if Favorite.objects.filter(user=user, recipe=recipe).exists():
-            raise serializers.ValidationError(
-                f"Рецепт '{recipe.name}' уже в избранном"
-            )
-        return data
-
+        except (AttributeError, ValueError, TypeError):
+            return None
+        return limit if limit >= 0 else None
 
-class ShoppingCartSerializer(FavoriteShoppingCartSerializer):
-    """Сериализатор для добавления рецепта в корзину покупок."""
-    class Meta(FavoriteShoppingCartSerializer.Meta):
-        model = ShoppingCart
-        extra_kwargs = {
-            'recipe': {'write_only': True},
-            'user': {'write_only': True}
-        }
-
-    def validate(self, data):
-        """Проверяет, не добавлен ли рецепт уже в корзину."""
-        user = data['user']
-        recipe = data['recipe']
-
-        if ShoppingCart.objects.filter(user=user, recipe=recipe).exists():
-            raise serializers.ValidationError(
-                f"Рецепт '{recipe.name}' уже в корзине покупок"
-            )
-        return data
+    @cached_property
+    def recipe_serializer(self):
+        """
+        Общий сериализатор рецептов для всех авторов на странице.
+        При many=True экземпляр дочернего сериализатора один на список,
+        поэтому поля рецептов строятся один раз за запрос.
+        """
+        return RecipeShortSerializer(context=self.context)
 
-    def to_representation(self, instance):
-        """Возвращает краткое представление рецепта после добавления."""
-        return RecipeShortSerializer(
-            instance.recipe,
-            context=self.context
-        ).data
+    def get_recipes(self, obj):
+        """Возвращает ограниченное количество рецептов пользователя."""
+        recipes = getattr(obj, 'short_recipes', None)
+        if recipes is None:
+            recipes = obj.recipes.all()
+        if self.recipes_limit is not None:
+            recipes = recipes[:self.recipes_limit]
+
+        return [
+            self.recipe_serializer.to_representation(recipe)
+            for recipe in recipes
+        ]
 
 
 class AvatarSerializer(serializers.Serializer):
     """Сериализатор для загрузки аватара пользователя."""
 
-    avatar = Base64ImageField(required=True)
+    avatar = StreamingBase64ImageField(required=True)
 
 
-class RecipeIngredientSerializer(serializers.ModelSerializer):
+class RecipeIngredientSerializer(
+    CachedFieldsMixin, serializers.ModelSerializer
+):
     """Сериализатор для связи рецепта и ингредиента."""
 
-    id = serializers.PrimaryKeyRelatedField(
-        queryset=Ingredient.objects.all(),
-        source="ingredient.id",
-    )
+    id = serializers.IntegerField(source="ingredient_id")
     name = serializers.CharField(
         source="ingredient.name",
         read_only=True,
@@ -184,7 +157,7 @@ class RecipeIngredientSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "measurement_unit", "amount")
 
 
-class RecipeShortSerializer(serializers.ModelSerializer):
+class RecipeShortSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для краткого представления рецепта."""
 
     class Meta:
@@ -193,24 +166,25 @@ class RecipeShortSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Основной сериализатор для модели Recipe."""
-    author = UserSerializer(read_only=True)
+    author = serializers.SerializerMethodField()
     ingredients = RecipeIngredientSerializer(
         many=True,
         source="recipe_ingredients",
     )
-    tags = serializers.PrimaryKeyRelatedField(
-        queryset=Tag.objects.all(),
-        many=True,
+    tags = serializers.ListField(
+        child=serializers.IntegerField(),
         write_only=True,
     )
-    image = Base64ImageField(required=True, allow_null=False)
+    image = StreamingBase64ImageField(required=True, allow_null=False)
     cooking_time = serializers.IntegerField(
         validators=[MinValueValidator(consts.MIN_COOKING_TIME)]
     )
-    is_in_shopping_cart = serializers.SerializerMethodField()
-    is_favorited = serializers.SerializerMethodField()
+    is_in_shopping_cart = serializers.BooleanField(
+        read_only=True, default=False
+    )
+    is_favorited = serializers.BooleanField(read_only=True, default=False)
 
     class Meta:
         model = Recipe
@@ -220,32 +194,107 @@ class RecipeSerializer(serializers.ModelSerializer):
             "is_favorited", "is_in_shopping_cart"
         ]
 
+    @cached_property
+    def tags_representation_cache(self):
+        """
+        Представления тегов, общие для всех рецептов ответа:
+        при many=True экземпляр сериализатора один на список.
+        """
+        return {}
+
+    def _represent_tag(self, tag):
+        """Возвращает представление тега, формируя его один раз."""
+        representation = self.tags_representation_cache.get(tag.id)
+        if representation is None:
+            representation = {"id": tag.id, "name": tag.name, "slug": tag.slug}
+            self.tags_representation_cache[tag.id] = representation
+        return representation
+
+    def get_author(self, obj):
+        """
+        Данные автора в формате UserSerializer без создания
+        вложенного сериализатора. Признак подписки берется
+        из аннотации is_author_subscribed, если она есть.
+        """
+        author = obj.author
+        request = self.context.get("request")
+        avatar = None
+        if author.avatar:
+            avatar = author.avatar.url
+            if request is not None:
+                avatar = request.build_absolute_uri(avatar)
+        is_subscribed = getattr(obj, "is_author_subscribed", None)
+        if is_subscribed is None:
+            is_subscribed = bool(
+                request
+                and request.user.is_authenticated
+                and request.user.subscriptions.filter(
+                    subscribed_to_id=author.id
+                ).exists()
+            )
+        return {
+            "email": author.email,
+            "id": author.id,
+            "username": author.username,
+            "first_name": author.first_name,
+            "last_name": author.last_name,
+            "is_subscribed": is_subscribed,
+            "avatar": avatar,
+        }
+
     def to_representation(self, instance):
         """Добавляет полные данные тегов в ответ."""
 
         rep = super().to_representation(instance)
-        rep["tags"] = TagSerializer(
-            instance.tags.all(),
-            many=True,
-        ).data
+        rep["tags"] = [self._represent_tag(tag) for tag in instance.tags.all()]
 
         return rep
 
+    def validate_image(self, image):
+        """Запрещает пустое изображение: поле уже декодировано."""
+        if not image:
+            raise serializers.ValidationError(
+                'Изображение обязательно при создании рецепта'
+            )
+        return image
+
+    def validate_tags(self, tags_ids):
+        """
+        Проверяет существование тегов одним запросом вместо
+        отдельного запроса на каждый первичный ключ.
+        """
+        existing = Tag.objects.in_bulk(tags_ids)
+        missing = [pk for pk in tags_ids if pk not in existing]
+        if missing:
+            raise serializers.ValidationError(
+                f'Теги не найдены: {missing}'
+            )
+        return [existing[pk] for pk in tags_ids]
+
+    def validate_ingredients(self, ingredients):
+        """
+        Проверяет существование ингредиентов одним запросом
+        и подставляет найденные объекты в данные.
+        """
+        ingredients_ids = [item['ingredient_id'] for item in ingredients]
+        existing = Ingredient.objects.in_bulk(ingredients_ids)
+        missing = [pk for pk in ingredients_ids if pk not in existing]
+        if missing:
+            raise serializers.ValidationError(
+                f'Ингредиенты не найдены: {missing}'
+            )
+        for item in ingredients:
+            item['ingredient'] = existing[item.pop('ingredient_id')]
+        return ingredients
+
     def validate(self, data):
         tags = data.get('tags', [])
         ingredients = data.get('recipe_ingredients', [])
-        if self.context['request'].method != 'PATCH':
-            image = data.get('image')
-            if not image:
-                raise serializers.ValidationError(
-                    {'image': 'Изображение обязательно при создании рецепта'}
-                )
         if not tags:
             raise serializers.ValidationError(
                 {'tags': 'Поле tags не может быть пустым'}
             )
-        tag_ids = [tag.id for tag in tags]
-        if len(tag_ids) != len(set(tag_ids)):
+        if self._has_duplicates(tag.id for tag in tags):
             raise serializers.ValidationError(
                 {'tags': 'Дублирование не применимо.'}
             )
@@ -253,27 +302,70 @@ class RecipeSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 {'recipe_ingredients': 'Поле ingredients не может быть пустым'}
             )
-        ingredients_ids = [
-            ingredient['ingredient']['id'].id for ingredient in ingredients
-        ]
-        if len(ingredients_ids) != len(set(ingredients_ids)):
+        if self._has_duplicates(
+            ingredient['ingredient'].id for ingredient in ingredients
+        ):
             raise serializers.ValidationError(
-                {'tags': 'Дублирование не применимо.'}
+                {'ingredients': 'Дублирование не применимо.'}
             )
         return data
 
+    @staticmethod
+    def _has_duplicates(values):
+        """Проверяет наличие повторов, останавливаясь на первом из них."""
+        seen = set()
+        for value in values:
+            if value in seen:
+                return True
+            seen.add(value)
+        return False
+
     @staticmethod
     def _create_recipe_ingredients(recipe, ingredients_data):
         """Создает связи рецепта с ингредиентами."""
         RecipeIngredient.objects.bulk_create([
             RecipeIngredient(
                 recipe=recipe,
-                ingredient=ingredient_data["ingredient"]["id"],
+                ingredient=ingredient_data["ingredient"],
                 amount=ingredient_data["amount"],
             )
             for ingredient_data in ingredients_data
         ])
 
+    @staticmethod
+    def _update_recipe_ingredients(recipe, ingredients_data):
+        """
+        Синхронизирует ингредиенты рецепта с новыми данными:
+        изменяет только добавленные, удаленные и измененные строки.
+        """
+        existing = {
+            recipe_ingredient.ingredient_id: recipe_ingredient
+            for recipe_ingredient in recipe.recipe_ingredients.all()
+        }
+        to_create = []
+        to_update = []
+        for ingredient_data in ingredients_data:
+            ingredient = ingredient_data["ingredient"]
+            amount = ingredient_data["amount"]
+            recipe_ingredient = existing.pop(ingredient.id, None)
+            if recipe_ingredient is None:
+                to_create.append(RecipeIngredient(
+                    recipe=recipe, ingredient=ingredient, amount=amount
+                ))
+            elif recipe_ingredient.amount != amount:
+                recipe_ingredient.amount = amount
+                to_update.append(recipe_ingredient)
+
+        if existing:
+            RecipeIngredient.objects.filter(
+                pk__in=[item.pk for item in existing.values()]
+            ).delete()
+        if to_update:
+            RecipeIngredient.objects.bulk_update(to_update, ["amount"])
+        if to_create:
+            RecipeIngredient.objects.bulk_create(to_create)
+
+    @transaction.atomic
     def create(self, validated_data):
         """Создает новый рецепт с ингредиентами и тегами."""
         ingredients_data = validated_data.pop("recipe_ingredients", [])
@@ -284,31 +376,13 @@ class RecipeSerializer(serializers.ModelSerializer):
         self._create_recipe_ingredients(recipe, ingredients_data)
         return recipe
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """Обновляет существующий рецепт с ингредиентами и тегами."""
-        if 'image' not in validated_data:
-            validated_data['image'] = instance.image
         ingredients_data = validated_data.pop("recipe_ingredients", [])
         tags_data = validated_data.pop("tags", [])
 
         instance = super().update(instance, validated_data)
         instance.tags.set(tags_data)
-        instance.recipe_ingredients.all().delete()
-        self._create_recipe_ingredients(instance, ingredients_data)
+        self._update_recipe_ingredients(instance, ingredients_data)
         return instance
-
-    def get_is_favorited(self, obj):
-        """Проверяет, добавлен ли рецепт в избранное."""
-        request = self.context.get("request")
-        return (
-            request and request.user.is_authenticated
-            and obj.favorites.filter(user=request.user).exists()
-        )
-
-    def get_is_in_shopping_cart(self, obj):
-        """Проверяет, добавлен ли рецепт в список покупок."""
-        request = self.context.get("request")
-        return (
-            request and request.user.is_authenticated
-            and obj.shopping_carts.filter(user=request.user).exists()
-        )
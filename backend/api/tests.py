@@ -0,0 +1,116 @@
+import base64
+import io
+import tempfile
+
+from django.conf import settings
+from django.core.cache import CacheHandler
+from django.test import SimpleTestCase, TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from api.fields import StreamingBase64ImageField
+from foodgram import consts
+from recipes.models import Tag
+
+
+class StreamingBase64ImageFieldTest(SimpleTestCase):
+    """Тесты декодирования изображений из base64."""
+
+    @staticmethod
+    def make_png():
+        """PNG, который в base64 занимает несколько частей по CHUNK_SIZE."""
+        buffer = io.BytesIO()
+        Image.effect_noise((64, 64), 100).save(buffer, format='PNG')
+        return buffer.getvalue()
+
+    def decode(self, base64_data):
+        upload = StreamingBase64ImageField().to_internal_value(base64_data)
+        self.addCleanup(upload.close)
+        upload.seek(0)
+        return upload
+
+    def test_plain_base64(self):
+        image = self.make_png()
+        upload = self.decode(base64.b64encode(image).decode())
+        self.assertEqual(upload.read(), image)
+        self.assertTrue(upload.name.endswith('.png'))
+
+    def test_data_uri(self):
+        image = self.make_png()
+        upload = self.decode(
+            'data:image/png;base64,' + base64.b64encode(image).decode()
+        )
+        self.assertEqual(upload.read(), image)
+        self.assertTrue(upload.name.endswith('.png'))
+
+    def test_line_wrapped_base64(self):
+        image = self.make_png()
+        wrapped = base64.encodebytes(image).decode()
+        self.assertGreater(
+            len(wrapped), StreamingBase64ImageField.CHUNK_SIZE
+        )
+        upload = self.decode(wrapped)
+        self.assertEqual(upload.read(), image)
+
+
+class ReferenceCacheMixin:
+    """Отдельный каталог кэша справочников на каждый тест."""
+
+    def setUp(self):
+        super().setUp()
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        caches_override = override_settings(CACHES={
+            **settings.CACHES,
+            consts.REFERENCE_CACHE: {
+                **settings.CACHES[consts.REFERENCE_CACHE],
+                'LOCATION': cache_dir.name,
+            },
+        })
+        caches_override.enable()
+        self.addCleanup(caches_override.disable)
+        self.client = APIClient()
+
+
+class ReferenceListCacheTest(ReferenceCacheMixin, TestCase):
+    """Тесты кэширования списков тегов и ингредиентов."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Tag.objects.create(name='Завтрак', slug='breakfast')
+
+    def test_cache_varies_on_accept(self):
+        for url in ('/api/tags/', '/api/ingredients/'):
+            with self.subTest(url=url):
+                html = self.client.get(url, HTTP_ACCEPT='text/html')
+                json = self.client.get(url, HTTP_ACCEPT='application/json')
+                self.assertTrue(html['Content-Type'].startswith('text/html'))
+                self.assertTrue(
+                    json['Content-Type'].startswith('application/json')
+                )
+
+
+class ReferenceCacheInvalidationTest(ReferenceCacheMixin, TestCase):
+    """Тесты сброса кэша справочников."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tag = Tag.objects.create(name='Завтрак', slug='breakfast')
+
+    def tag_names(self):
+        response = self.client.get('/api/tags/')
+        return [tag['name'] for tag in response.json()]
+
+    def test_tag_save_clears_cache(self):
+        self.assertEqual(self.tag_names(), ['Завтрак'])
+        self.tag.name = 'Обед'
+        self.tag.save()
+        self.assertEqual(self.tag_names(), ['Обед'])
+
+    def test_clear_from_another_cache_handler(self):
+        """Сброс из другого процесса, например из load_data_csv."""
+        self.assertEqual(self.tag_names(), ['Завтрак'])
+        Tag.objects.filter(pk=self.tag.pk).update(name='Ужин')
+        self.assertEqual(self.tag_names(), ['Завтрак'])
+        CacheHandler()[consts.REFERENCE_CACHE].clear()
+        self.assertEqual(self.tag_names(), ['Ужин'])
@@ -1,9 +1,9 @@
-from io import BytesIO
-from datetime import datetime
+from functools import lru_cache
 
 from django.core.files.storage import default_storage
-from django.db.models import Sum
-from django.http import FileResponse
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, OuterRef, Prefetch, Value
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models.functions import Lower
@@ -15,8 +15,14 @@ from rest_framework import (
     response
 )
 from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control, cache_page
+from django.views.decorators.vary import vary_on_headers
 from djoser.views import UserViewSet as DjoserUserViewSet
 
+from foodgram import consts
 from recipes.models import (
     Recipe,
     RecipeIngredient,
@@ -28,7 +34,8 @@ from recipes.models import (
     Tag,
 )
 from api.filters import IngredientSearchFilter, CustomRecipeFilter
-from api.paginations import CustomPagination
+from api.mixins import SharedInstancesMixin
+from api.paginations import CustomPagination, RecipePagination
 from api.permissions import IsAuthorOrReadOnly
 from api.serializers import (
     AvatarSerializer,
@@ -36,28 +43,62 @@ from api.serializers import (
     RecipeSerializer,
     UserSerializer,
     UserSubscriptionSerializer,
-    RecipeShortSerializer,
     TagSerializer,
-    FavoriteSerializer,
-    ShoppingCartSerializer
 )
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+@lru_cache(maxsize=4096)
+def _short_link_path(pk):
+    """Путь короткой ссылки зависит только от pk рецепта."""
+    return reverse('redirect_recipe', kwargs={'pk': pk})
+
+
+class TagViewSet(SharedInstancesMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     pagination_class = None
 
-
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+    @method_decorator(
+        cache_control(max_age=consts.REFERENCE_CLIENT_MAX_AGE)
+    )
+    @method_decorator(cache_page(
+        consts.REFERENCE_CACHE_TIMEOUT, cache=consts.REFERENCE_CACHE
+    ))
+    @method_decorator(vary_on_headers('Accept'))
+    def list(self, request, *args, **kwargs):
+        """Возвращает список тегов без сериализатора."""
+        queryset = self.filter_queryset(self.get_queryset())
+        return response.Response(list(queryset.values('id', 'name', 'slug')))
+
+
+class IngredientViewSet(
+    SharedInstancesMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = Ingredient.objects.all().order_by(Lower('name'))
     serializer_class = IngredientSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = IngredientSearchFilter
     pagination_class = None
 
+    @method_decorator(
+        cache_control(max_age=consts.REFERENCE_CLIENT_MAX_AGE)
+    )
+    @method_decorator(cache_page(
+        consts.REFERENCE_CACHE_TIMEOUT, cache=consts.REFERENCE_CACHE
+    ))
+    @method_decorator(vary_on_headers('Accept'))
+    def list(self, request, *args, **kwargs):
+        """
+        Возвращает список ингредиентов без сериализатора:
+        данные только для чтения и состоят из трех колонок.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return response.Response(
+            list(queryset.values('id', 'name', 'measurement_unit'))
+        )
+
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(SharedInstancesMixin, viewsets.ModelViewSet):
     """
     Вьюсет для работы с рецептами.
     Поддерживает создание, просмотр, редактирование и удаление рецептов,
@@ -70,31 +111,76 @@ class RecipeViewSet(viewsets.ModelViewSet):
         permissions.IsAuthenticatedOrReadOnly,
         IsAuthorOrReadOnly,
     ]
-    pagination_class = CustomPagination
+    pagination_class = RecipePagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = CustomRecipeFilter
+    # Колонки рецепта и автора, нужные для чтения рецептов
+    read_only_columns = (
+        'id', 'name', 'image', 'text', 'cooking_time', 'author',
+        'author__id', 'author__email', 'author__username',
+        'author__first_name', 'author__last_name', 'author__avatar',
+    )
+
+    def get_queryset(self):
+        """
+        Подгружает связанные данные рецептов и аннотирует их
+        признаками избранного, списка покупок и подписки на автора.
+        При чтении выбирает только нужные колонки автора,
+        при удалении - только колонки для проверки прав.
+        """
+        if self.action == 'destroy':
+            return super().get_queryset().only('id', 'author')
+        queryset = super().get_queryset().with_related()
+        if self.action in ('list', 'retrieve'):
+            queryset = queryset.only(*self.read_only_columns)
+        return queryset.with_user_flags(self.request.user)
 
     def perform_create(self, serializer):
         """Автоматически устанавливает автора при создании рецепта."""
         serializer.save(author=self.request.user)
 
     @staticmethod
-    def _add_relation(request, pk, serializer_class, model, relation_name):
+    def _add_relation(request, pk, model, relation_name):
         """Общий метод для добавления связи (избранное/корзина)."""
-        recipe = get_object_or_404(Recipe, id=pk)
-
-        serializer = serializer_class(
-            data={'recipe': recipe.id},
-            context={'request': request}
+        recipe = get_object_or_404(
+            Recipe.objects.only('id', 'name', 'image', 'cooking_time'),
+            id=pk
         )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+
+        # Дубликат отсекает уникальный индекс. Транзакция объединяет
+        # INSERT с обновлением счетчика избранного из сигнала.
+        try:
+            with transaction.atomic():
+                model.objects.create(user=request.user, recipe=recipe)
+        except IntegrityError:
+            return response.Response(
+                {'non_field_errors': [
+                    f"Рецепт '{recipe.name}' уже в {relation_name}"
+                ]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         return response.Response(
-            RecipeShortSerializer(recipe, context={'request': request}).data,
+            RecipeViewSet._short_recipe_data(recipe, request),
             status=status.HTTP_201_CREATED
         )
 
+    @staticmethod
+    def _short_recipe_data(recipe, request):
+        """
+        Краткое представление рецепта, совпадающее
+        с выводом RecipeShortSerializer.
+        """
+        return {
+            'id': recipe.id,
+            'name': recipe.name,
+            'image': (
+                request.build_absolute_uri(recipe.image.url)
+                if recipe.image else None
+            ),
+            'cooking_time': recipe.cooking_time,
+        }
+
     @staticmethod
     def _remove_relation(request, pk, model):
         """Общий метод для удаления связи (избранное/корзина)."""
@@ -120,7 +206,7 @@ class RecipeViewSet(viewsets.ModelViewSet):
     )
     def favorite(self, request, pk=None):
         return self._add_relation(
-            request, pk, FavoriteSerializer, Favorite, 'избранном'
+            request, pk, Favorite, 'избранном'
         )
 
     @favorite.mapping.delete
@@ -135,7 +221,7 @@ class RecipeViewSet(viewsets.ModelViewSet):
     )
     def shopping_cart(self, request, pk=None):
         return self._add_relation(
-            request, pk, ShoppingCartSerializer, ShoppingCart, 'корзине'
+            request, pk, ShoppingCart, 'корзине покупок'
         )
 
     @shopping_cart.mapping.delete
@@ -152,11 +238,17 @@ class RecipeViewSet(viewsets.ModelViewSet):
         Генерирует короткую ссылку на рецепт.
         Возвращает URL для перенаправления к рецепту.
         """
-        get_object_or_404(Recipe, id=pk)
-        short_url = request.build_absolute_uri(
-            reverse('redirect_recipe', kwargs={'pk': pk})
+        if not Recipe.objects.filter(id=pk).exists():
+            raise Http404
+        short_url = request.build_absolute_uri(_short_link_path(pk))
+        link_response = response.Response({"short-link": short_url})
+        patch_cache_control(
+            link_response,
+            public=True,
+            max_age=consts.SHORT_LINK_MAX_AGE,
+            immutable=True,
         )
-        return response.Response({"short-link": short_url})
+        return link_response
 
     @decorators.action(
         detail=False,
@@ -171,47 +263,90 @@ class RecipeViewSet(viewsets.ModelViewSet):
         """
         recipes = Recipe.objects.filter(
             shopping_carts__user=request.user
-        ).prefetch_related('recipe_ingredients__ingredient', 'author')
-
-        ingredients = (
-            RecipeIngredient.objects.filter(recipe__in=recipes)
-            .values('ingredient__name', 'ingredient__measurement_unit')
-            .annotate(total_amount=Sum('amount'))
-            .order_by('ingredient__name')
+        ).values_list('name', 'author__username')
+
+        ingredients = RecipeIngredient.objects.shopping_list(request.user)
+        # Ингредиент уникален по названию и единице измерения,
+        # поэтому число строк отчета равно числу разных ингредиентов.
+        totals = ShoppingCart.objects.filter(user=request.user).aggregate(
+            recipes_count=Count('recipe', distinct=True),
+            ingredients_count=Count(
+                'recipe__recipe_ingredients__ingredient', distinct=True
+            ),
         )
 
-        report_content = [
-            "Список покупок",
-            f"Дата составления: {datetime.now().strftime('%d.%m.%Y %H:%M')}",
-            f"Всего рецептов: {len(recipes)}",
-            f"Всего ингредиентов: {len(ingredients)}",
-            "",
-            "Список продуктов:",
-            *[
-                f"{idx}. {ing['ingredient__name'].capitalize()} - "
-                f"{ing['total_amount']} {ing['ingredient__measurement_unit']}"
-                for idx, ing in enumerate(ingredients, start=1)
-            ],
-            "",
-            "Рецепты:",
-            *[
-                f"- {recipe.name} (автор: {recipe.author.username})"
-                for recipe in recipes
-            ]
-        ]
-
-        buffer = BytesIO('\n'.join(report_content).encode('utf-8'))
-        return FileResponse(
-            buffer,
-            as_attachment=True,
-            filename=f"shopping_list_{datetime.now().strftime('%Y%m%d')}.txt",
-            content_type='text/plain'
+        now = timezone.localtime()
+        file_response = StreamingHttpResponse(
+            (
+                line.encode('utf-8')
+                for line in self._iter_report(
+                    now, totals, recipes, ingredients
+                )
+            ),
+            content_type='text/plain; charset=utf-8'
         )
+        file_response['Content-Disposition'] = (
+            f'attachment; filename="shopping_list_{now:%Y%m%d}.txt"'
+        )
+        return file_response
+
+    @staticmethod
+    def _iter_report(now, totals, recipes, ingredients):
+        """
+        Построчно формирует список покупок,
+        не собирая весь отчет в памяти.
+        """
+        yield "Список покупок\n"
+        yield f"Дата составления: {now:%d.%m.%Y %H:%M}\n"
+        yield f"Всего рецептов: {totals['recipes_count']}\n"
+        yield f"Всего ингредиентов: {totals['ingredients_count']}\n"
+        yield "\nСписок продуктов:"
+        for idx, (name, unit, amount) in enumerate(
+            ingredients.iterator(chunk_size=500), start=1
+        ):
+            yield f"\n{idx}. {name.capitalize()} - {amount} {unit}"
+        yield "\n\nРецепты:"
+        for name, author in recipes.iterator(chunk_size=200):
+            yield f"\n- {name} (автор: {author})"
 
 
 class UserViewSet(DjoserUserViewSet):
     pagination_class = CustomPagination
 
+    def get_queryset(self):
+        """
+        Аннотирует пользователей признаком подписки на них
+        и количеством рецептов для ответа на подписку.
+        """
+        queryset = super().get_queryset()
+        user = self.request.user
+        if self.action == 'subscribe' and self.request.method == 'POST':
+            return self._with_recipes_data(queryset)
+        if user.is_authenticated and self.action in ['list', 'retrieve']:
+            queryset = queryset.annotate(
+                is_subscribed=Exists(
+                    Subscription.objects.filter(
+                        user=user, subscribed_to=OuterRef('pk')
+                    )
+                )
+            )
+        return queryset
+
+    @staticmethod
+    def _with_recipes_data(queryset):
+        """Добавляет к авторам количество и краткие данные их рецептов."""
+        return queryset.annotate(
+            recipes_count=Count('recipes')
+        ).prefetch_related(
+            Prefetch(
+                'recipes',
+                queryset=Recipe.objects.only(
+                    'id', 'author', 'name', 'image', 'cooking_time'
+                ),
+                to_attr='short_recipes',
+            )
+        )
+
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             return [permissions.AllowAny()]
@@ -246,7 +381,7 @@ class UserViewSet(DjoserUserViewSet):
         serializer.is_valid(raise_exception=True)
 
         request.user.avatar = serializer.validated_data["avatar"]
-        request.user.save()
+        request.user.save(update_fields=['avatar'])
 
         return response.Response(
             {"avatar": request.user.avatar.url},
@@ -264,17 +399,19 @@ class UserViewSet(DjoserUserViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Получаем путь к файлу до удаления
-        avatar_path = user.avatar.path
+        # Получаем имя файла до удаления
+        avatar_name = user.avatar.name
 
         try:
-            # Удаляем файл с диска
-            if default_storage.exists(avatar_path):
-                default_storage.delete(avatar_path)
-
             # Обновляем запись в БД
             user.avatar = None
-            user.save()
+            user.save(update_fields=['avatar'])
+
+            # Файл удаляется после фиксации изменений; delete() для
+            # отсутствующего файла ничего не делает, проверка не нужна
+            transaction.on_commit(
+                lambda: default_storage.delete(avatar_name)
+            )
 
             return response.Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -298,24 +435,25 @@ class UserViewSet(DjoserUserViewSet):
         return self._delete_subscription(user, author)
 
     def _create_subscription(self, user, author, request):
-        """Создает подписку на пользователя"""
-        serializer = UserSubscriptionSerializer(
-            data={},
-            context={
-                'request': request,
-                'view': self
-            }
-        )
-
-        if not serializer.is_valid():
+        """
+        Создает подписку на пользователя.
+        Повторную подписку отсекает уникальное ограничение в БД.
+        """
+        if user.pk == author.pk:
             return response.Response(
-                serializer.errors,
+                {'subscribed_to': ['Нельзя подписаться на самого себя']},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        subscription = Subscription(user=user, subscribed_to=author)
-        subscription.save()
+        try:
+            Subscription.objects.create(user=user, subscribed_to=author)
+        except IntegrityError:
+            return response.Response(
+                {'subscribed_to': ['Вы уже подписаны на этого пользователя']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
+        author.is_subscribed = True
         data = UserSubscriptionSerializer(
             author, context={'request': request}
         ).data
@@ -344,7 +482,11 @@ class UserViewSet(DjoserUserViewSet):
     )
     def subscriptions(self, request, *args, **kwargs):
         user = request.user
-        queryset = User.objects.filter(subscribers__user=user)
+        queryset = self._with_recipes_data(
+            User.objects.filter(subscribers__user=user).annotate(
+                is_subscribed=Value(True)
+            )
+        )
         pages = self.paginate_queryset(queryset)
         serializer = UserSubscriptionSerializer(
             pages, many=True, context={"request": request}
@@ -10,3 +10,7 @@ MAX_PAGE_SIZE = 100
 LIST_PER_PAGE = 20
 MAX_WIDTH_SIZE = 500
 MAX_HEIGHT_SIZE = 500
+REFERENCE_CACHE = "reference"
+REFERENCE_CACHE_TIMEOUT = 3600
+REFERENCE_CLIENT_MAX_AGE = 60
+SHORT_LINK_MAX_AGE = 86400
@@ -72,6 +72,26 @@ DATABASES = {
         "PASSWORD": config("DB_PASSWORD", default="postgres"),
         "HOST": config("DB_HOST", default="db"),
         "PORT": config("DB_PORT", default=5432, cast=int),
+        # Постоянные соединения вместо нового подключения на каждый запрос
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=60, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "application_name": "foodgram",
+        },
+    },
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Ответы со списками тегов и ингредиентов. Кэш общий для всех
+    # процессов, чтобы его очищали и веб-воркеры, и команды manage.py.
+    "reference": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": config(
+            "REFERENCE_CACHE_DIR", default="/tmp/foodgram_reference_cache"
+        ),
     },
 }
 
@@ -100,6 +120,10 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_PAGINATION_CLASS":
         "rest_framework.pagination.LimitOffsetPagination",
     "DEFAULT_FILTER_BACKENDS": (
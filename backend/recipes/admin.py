@@ -1,7 +1,15 @@
+from functools import lru_cache
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 from django.utils.html import mark_safe
 
+from foodgram import consts
 from recipes.models import (
     User, Tag, Ingredient,
     Recipe, RecipeIngredient,
@@ -9,6 +17,62 @@ from recipes.models import (
 )
 
 
+@lru_cache(maxsize=4096)
+def image_tag(url):
+    """HTML превью изображения, общий для повторных отрисовок."""
+    return mark_safe(f'<img src="{url}" width="100" />')
+
+
+def subquery_count(queryset, field):
+    """
+    Количество связанных строк коррелированным подзапросом.
+    В отличие от нескольких Count по JOIN, счетчики не
+    перемножают строки друг друга.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(count=Count('pk'))
+            .values('count'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор, берущий число строк нефильтрованной таблицы
+    из статистики PostgreSQL вместо COUNT(*) по всей таблице.
+    Небольшие таблицы и выборки с фильтрами считаются точно.
+    """
+
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        if self.object_list.query.where:
+            return super().count
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [self.object_list.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < self.exact_count_threshold:
+            return super().count
+        return row[0]
+
+
+class EstimatedCountMixin:
+    """Оценочный подсчет строк для больших таблиц связей."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     list_display = (
@@ -28,13 +92,22 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
 
-    @admin.display(description='Рецепты')
+    def get_queryset(self, request):
+        """Считает рецепты и подписчиков одним запросом на страницу."""
+        return super().get_queryset(request).annotate(
+            _recipes_count=subquery_count(Recipe.objects, 'author'),
+            _subscribers_count=subquery_count(
+                Subscription.objects, 'subscribed_to'
+            ),
+        )
+
+    @admin.display(description='Рецепты', ordering='_recipes_count')
     def recipes_count(self, obj):
-        return obj.recipes.count()
+        return obj._recipes_count
 
-    @admin.display(description='Подписчики')
+    @admin.display(description='Подписчики', ordering='_subscribers_count')
     def subscribers_count(self, obj):
-        return obj.subscribers.count()
+        return obj._subscribers_count
 
 
 @admin.register(Tag)
@@ -48,46 +121,62 @@ class IngredientAdmin(admin.ModelAdmin):
     list_display = ('name', 'measurement_unit')
     search_fields = ('name',)
     list_filter = ('measurement_unit',)
+    list_per_page = consts.LIST_PER_PAGE
 
 
 class RecipeIngredientInline(admin.TabularInline):
     model = RecipeIngredient
     extra = 1
     min_num = 1
+    autocomplete_fields = ('ingredient',)
 
 
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
     list_display = ('name', 'author', 'cooking_time', 'favorites_count')
+    list_select_related = ('author',)
+    autocomplete_fields = ('author', 'tags')
     search_fields = ('name', 'author__username')
     list_filter = ('tags',)
+    list_per_page = consts.LIST_PER_PAGE
     inlines = (RecipeIngredientInline,)
-    readonly_fields = ('image_preview',)
+    readonly_fields = ('image_preview', 'favorites_count')
 
     @admin.display(description='Изображение')
     def image_preview(self, obj):
         if obj.image:
-            return mark_safe(f'<img src="{obj.image.url}" width="100" />')
+            return image_tag(obj.image.url)
         return "-"
 
-    @admin.display(description='В избранном')
-    def favorites_count(self, obj):
-        return obj.favorites.count()
-
 
 @admin.register(Subscription)
-class SubscriptionAdmin(admin.ModelAdmin):
+class SubscriptionAdmin(EstimatedCountMixin, admin.ModelAdmin):
     list_display = ('user', 'subscribed_to')
+    list_select_related = ('user', 'subscribed_to')
+    autocomplete_fields = ('user', 'subscribed_to')
     search_fields = ('user__username', 'subscribed_to__username')
 
 
 @admin.register(Favorite)
-class FavoriteAdmin(admin.ModelAdmin):
+class FavoriteAdmin(EstimatedCountMixin, admin.ModelAdmin):
     list_display = ('user', 'recipe')
-    search_fields = ('user__username', 'recipe__name')
+    list_select_related = ('user', 'recipe')
+    autocomplete_fields = ('user', 'recipe')
+    search_fields = ('^user__username', '^recipe__name')
+
+    def get_readonly_fields(self, request, obj=None):
+        """
+        Рецепт существующей записи не меняется: сигналы ведут
+        Recipe.favorites_count только при создании и удалении.
+        """
+        if obj is not None:
+            return ('recipe',)
+        return ()
 
 
 @admin.register(ShoppingCart)
-class ShoppingCartAdmin(admin.ModelAdmin):
+class ShoppingCartAdmin(EstimatedCountMixin, admin.ModelAdmin):
     list_display = ('user', 'recipe')
-    search_fields = ('user__username', 'recipe__name')
+    list_select_related = ('user', 'recipe')
+    autocomplete_fields = ('user', 'recipe')
+    search_fields = ('^user__username', '^recipe__name')
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RecipesConfig(AppConfig):
     name = "recipes"
     verbose_name = "Рецепты"
+
+    def ready(self):
+        from recipes import signals  # noqa: F401
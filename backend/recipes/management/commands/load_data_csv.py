@@ -1,12 +1,20 @@
-from csv import reader as csv_reader
+from django.core.cache import caches
 from django.core.management import BaseCommand
+from django.db import connection, transaction
+from foodgram import consts
 from recipes.models import Ingredient
 
 
 class Command(BaseCommand):
     """Команда для импорта данных об ингредиентах из CSV файла"""
 
-    help_text = 'Загрузка списка ингредиентов в базу данных'
+    help_text = (
+        'Загрузка списка ингредиентов в базу данных. '
+        'Каждая строка CSV должна содержать два столбца: '
+        'название и единицу измерения; строки с пустым '
+        'названием пропускаются.'
+    )
+    WHITESPACE = ' \t\r\n\v\f\u00a0'
 
     def execute_command(self):
         """Основная логика выполнения команды"""
@@ -14,8 +22,7 @@ class Command(BaseCommand):
 
         try:
             with open(p, mode='r', encoding='UTF-8') as file:
-                food_items = self._prepare_food_items(file)
-                saved_count = self._save_to_database(food_items)
+                saved_count = self._save_to_database(file)
 
                 self._show_success_message(saved_count, p)
 
@@ -24,22 +31,39 @@ class Command(BaseCommand):
         except Exception as error:
             self._show_error_message(f'Произошла ошибка: {error}')
 
-    def _prepare_food_items(self, file_object):
-        """Подготовка объектов модели из CSV файла"""
-        return [
-            Ingredient(
-                name=row[0].strip(),
-                measurement_unit=row[1].strip()
+    def _save_to_database(self, file_object):
+        """
+        Загрузка файла через COPY во временную таблицу и перенос
+        в таблицу ингредиентов с пропуском уже существующих.
+        COPY прерывает импорт на строке с другим числом столбцов,
+        в том числе на пустой строке.
+        Запись идет в обход ORM и сигналов, поэтому кэш
+        списка ингредиентов очищается явно.
+        """
+        table = connection.ops.quote_name(Ingredient._meta.db_table)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TEMP TABLE ingredient_import '
+                '(name text, measurement_unit text) ON COMMIT DROP'
             )
-            for row in csv_reader(file_object)
-        ]
-
-    def _save_to_database(self, items):
-        """Сохранение объектов в базу данных"""
-        return len(Ingredient.objects.bulk_create(
-            items,
-            ignore_conflicts=True
-        ))
+            cursor.copy_expert(
+                'COPY ingredient_import FROM STDIN WITH (FORMAT csv)',
+                file_object
+            )
+            # Пробельные символы обрезаются как str.strip(): TRIM
+            # убирает только пробелы, но не табуляцию, \r и NBSP.
+            cursor.execute(
+                f'INSERT INTO {table} (name, measurement_unit) '
+                'SELECT BTRIM(name, %(spaces)s), '
+                "BTRIM(COALESCE(measurement_unit, ''), %(spaces)s) "
+                'FROM ingredient_import '
+                "WHERE BTRIM(name, %(spaces)s) <> '' "
+                'ON CONFLICT DO NOTHING',
+                {'spaces': self.WHITESPACE}
+            )
+            saved_count = cursor.rowcount
+        caches[consts.REFERENCE_CACHE].clear()
+        return saved_count
 
     def _show_success_message(self, count, path):
         """Вывод сообщения об успешном выполнении"""
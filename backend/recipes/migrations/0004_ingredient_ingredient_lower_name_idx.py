@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-15 21:48
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_ingredient_ingredient_name_upper_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ingredient',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='ingredient_lower_name_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2 on 2026-10-15 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_ingredient_ingredient_lower_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['name'], name='recipe_name_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2 on 2026-10-15 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0007_recipe_user_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['author', 'name'], name='recipe_author_name_idx'),
+        ),
+        # Фильтр рецептов по тегу: выборка recipe_id по tag_id
+        # без обращения к таблице связей.
+        migrations.RunSQL(
+            sql='CREATE INDEX recipe_tags_tag_recipe_idx '
+                'ON recipes_recipe_tags (tag_id, recipe_id)',
+            reverse_sql='DROP INDEX recipe_tags_tag_recipe_idx',
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-15 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_recipe_author_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='recipe',
+            constraint=models.CheckConstraint(check=models.Q(('cooking_time__gte', 1)), name='recipe_cooking_time_min'),
+        ),
+        migrations.AddConstraint(
+            model_name='recipeingredient',
+            constraint=models.CheckConstraint(check=models.Q(('amount__gte', 1)), name='recipe_ingredient_amount_min'),
+        ),
+    ]
@@ -1,8 +1,12 @@
+import sys
+
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.validators import MinValueValidator
 from django.conf import settings
+from django.contrib.postgres.indexes import OpClass
+from django.db.models.functions import Lower, Upper
 
 from foodgram import consts
 
@@ -92,10 +96,74 @@ class Ingredient(models.Model):
                 name="unique_ingredient",
             ),
         ]
+        indexes = [
+            # Поиск по istartswith в PostgreSQL строится как
+            # UPPER(name) LIKE UPPER('...%').
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="ingredient_name_upper_idx",
+            ),
+            # Сортировка списка ингредиентов по LOWER(name).
+            models.Index(Lower("name"), name="ingredient_lower_name_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name}, {self.measurement_unit}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Единиц измерения немного, поэтому одинаковые строки
+        загруженных ингредиентов хранятся в одном экземпляре.
+        """
+        instance = super().from_db(db, field_names, values)
+        unit = instance.__dict__.get("measurement_unit")
+        if unit:
+            instance.measurement_unit = sys.intern(unit)
+        return instance
+
+
+class RecipeQuerySet(models.QuerySet):
+    """Выборки рецептов в том виде, в котором их выводит API."""
+
+    def with_related(self):
+        """
+        Подгружает автора, теги и ингредиенты рецептов.
+        Менеджер строк рецепта сам присоединяет ингредиент.
+        """
+        return self.select_related("author").prefetch_related(
+            "tags", "recipe_ingredients"
+        )
+
+    def with_user_flags(self, user):
+        """
+        Аннотирует рецепты признаками избранного, списка покупок
+        и подписки пользователя на автора.
+        """
+        if not user.is_authenticated:
+            return self.annotate(
+                is_favorited=models.Value(False),
+                is_in_shopping_cart=models.Value(False),
+                is_author_subscribed=models.Value(False),
+            )
+        return self.annotate(
+            is_favorited=models.Exists(
+                Favorite.objects.filter(
+                    user=user, recipe=models.OuterRef("pk")
+                )
+            ),
+            is_in_shopping_cart=models.Exists(
+                ShoppingCart.objects.filter(
+                    user=user, recipe=models.OuterRef("pk")
+                )
+            ),
+            is_author_subscribed=models.Exists(
+                Subscription.objects.filter(
+                    user=user, subscribed_to=models.OuterRef("author")
+                )
+            ),
+        )
+
 
 class Recipe(models.Model):
     """Основная модель рецептов."""
@@ -129,15 +197,56 @@ class Recipe(models.Model):
         Tag,
         verbose_name="Теги",
     )
+    favorites_count = models.PositiveIntegerField(
+        verbose_name="В избранном",
+        default=0,
+        editable=False,
+        db_index=True,
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Рецепт"
         verbose_name_plural = "Рецепты"
         ordering = ("name",)
         default_related_name = "recipes"
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(cooking_time__gte=consts.MIN_COOKING_TIME),
+                name="recipe_cooking_time_min",
+            ),
+        ]
+        indexes = [
+            # Порядок выдачи рецептов по умолчанию.
+            models.Index(fields=["name"], name="recipe_name_idx"),
+            # Рецепты автора в порядке выдачи по умолчанию.
+            models.Index(
+                fields=["author", "name"], name="recipe_author_name_idx"
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.name} (автор: {self.author.username})"
+        return self.name
+
+
+class RecipeIngredientManager(models.Manager):
+    """Менеджер, сразу подгружающий ингредиент строки рецепта."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("ingredient")
+
+    def shopping_list(self, user):
+        """
+        Суммарное количество каждого ингредиента по рецептам
+        из списка покупок пользователя, посчитанное одним GROUP BY.
+        """
+        return (
+            self.filter(recipe__shopping_carts__user=user)
+            .values_list("ingredient__name", "ingredient__measurement_unit")
+            .annotate(total_amount=models.Sum("amount"))
+            .order_by("ingredient__name")
+        )
 
 
 class RecipeIngredient(models.Model):
@@ -158,6 +267,8 @@ class RecipeIngredient(models.Model):
         validators=[MinValueValidator(consts.MIN_AMOUNT)],
     )
 
+    objects = RecipeIngredientManager()
+
     class Meta:
         verbose_name = "Ингредиент в рецепте"
         verbose_name_plural = "Ингредиенты в рецептах"
@@ -166,13 +277,19 @@ class RecipeIngredient(models.Model):
                 fields=["recipe", "ingredient"],
                 name="unique_recipe_ingredient",
             ),
+            models.CheckConstraint(
+                check=models.Q(amount__gte=consts.MIN_AMOUNT),
+                name="recipe_ingredient_amount_min",
+            ),
         ]
         default_related_name = "recipe_ingredients"
 
     def __str__(self):
+        # Только собственные колонки: строковое представление
+        # не должно запрашивать связанные объекты.
         return (
-            f"{self.ingredient.name} - {self.amount} "
-            f"{self.ingredient.measurement_unit}"
+            f"Рецепт #{self.recipe_id}: ингредиент "
+            f"#{self.ingredient_id} x {self.amount}"
         )
 
 
@@ -196,6 +313,15 @@ class UserRecipeRelation(models.Model):
                 name="unique_%(class)s",
             ),
         ]
+        indexes = [
+            # Обратный порядок колонок для выборок со стороны рецепта;
+            # уникальный индекс (user, recipe) покрывает выборки
+            # со стороны пользователя.
+            models.Index(
+                fields=["recipe", "user"],
+                name="%(class)s_recipe_user_idx",
+            ),
+        ]
 
 
 class Subscription(models.Model):
@@ -227,6 +353,12 @@ class Subscription(models.Model):
                 name="prevent_self_subscription",
             ),
         ]
+        indexes = [
+            models.Index(
+                fields=["subscribed_to", "user"],
+                name="subscription_author_user_idx",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -0,0 +1,31 @@
+from django.core.cache import caches
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from foodgram import consts
+from recipes.models import Favorite, Ingredient, Recipe, Tag
+
+
+@receiver((post_save, post_delete), sender=Tag)
+@receiver((post_save, post_delete), sender=Ingredient)
+def clear_reference_cache(**kwargs):
+    """Сбрасывает закэшированные списки тегов и ингредиентов."""
+    caches[consts.REFERENCE_CACHE].clear()
+
+
+@receiver(post_save, sender=Favorite)
+def increase_favorites_count(instance, created, **kwargs):
+    """Увеличивает счетчик избранного рецепта без загрузки рецепта."""
+    if created:
+        Recipe.objects.filter(pk=instance.recipe_id).update(
+            favorites_count=F("favorites_count") + 1
+        )
+
+
+@receiver(post_delete, sender=Favorite)
+def decrease_favorites_count(instance, **kwargs):
+    """Уменьшает счетчик избранного рецепта."""
+    Recipe.objects.filter(
+        pk=instance.recipe_id, favorites_count__gt=0
+    ).update(favorites_count=F("favorites_count") - 1)
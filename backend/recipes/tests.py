@@ -0,0 +1,71 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from recipes.models import Favorite, Recipe, User
+
+
+class FavoritesCountTest(TestCase):
+    """Тесты счетчика избранного, который ведут сигналы."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='author', email='author@example.com',
+            first_name='Автор', last_name='Рецептов',
+        )
+        cls.reader = User.objects.create_user(
+            username='reader', email='reader@example.com',
+            first_name='Читатель', last_name='Рецептов',
+        )
+        cls.recipe = Recipe.objects.create(
+            author=cls.author,
+            name='Омлет',
+            text='Взбить яйца и обжарить.',
+            image='recipes/images/omelette.png',
+            cooking_time=10,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+        self.url = f'/api/recipes/{self.recipe.id}/favorite/'
+
+    def favorites_count(self):
+        self.recipe.refresh_from_db(fields=['favorites_count'])
+        return self.recipe.favorites_count
+
+    def test_add_favorite(self):
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.favorites_count(), 1)
+
+    def test_remove_favorite(self):
+        self.client.post(self.url)
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.favorites_count(), 0)
+
+    def test_duplicate_favorite(self):
+        self.client.post(self.url)
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.favorites_count(), 1)
+        self.assertEqual(Favorite.objects.count(), 1)
+
+    def test_remove_missing_favorite(self):
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.favorites_count(), 0)
+
+    def test_delete_user_with_favorites(self):
+        Favorite.objects.create(user=self.reader, recipe=self.recipe)
+        Favorite.objects.create(user=self.author, recipe=self.recipe)
+        self.assertEqual(self.favorites_count(), 2)
+        self.reader.delete()
+        self.assertEqual(self.favorites_count(), 1)
+
+    def test_delete_recipe_with_favorites(self):
+        Favorite.objects.create(user=self.reader, recipe=self.recipe)
+        self.recipe.delete()
+        self.assertFalse(Favorite.objects.exists())
@@ -1,9 +1,12 @@
 from django.shortcuts import redirect
 from django.http import Http404
+from django.views.decorators.cache import cache_control
 
+from foodgram import consts
 from recipes.models import Recipe
 
 
+@cache_control(public=True, max_age=consts.SHORT_LINK_MAX_AGE)
 def redirect_recipe(request, pk):
     if not Recipe.objects.filter(pk=pk).exists():
         raise Http404